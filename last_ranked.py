@@ -4,8 +4,10 @@ import asyncio
 from aiohttp import ClientSession
 import typing as t
 import json
+import os
+import tempfile
 from pathlib import Path
-from main import fetch_leaders, BROWSER_USER_AGENT, DELAY, METRICS, LOGGER, Metric, MetricLeader, submit_updates
+from main import fetch_leaders, make_session, run, CONCURRENCY, LOGGER, Metric, MetricLeader, submit_updates
 
 #########################################################
 # START Configuration
@@ -20,6 +22,14 @@ MAX_PAGE = 20_000 # Last league ended with 14_184 pages.
 LAST_PAGES_FILE = "last_pages.json"
 """ The file where all previous last pages are stored """
 
+SPECULATIVE_PROBES = False
+""" Whether to fetch both possible next midpoints while a binary search probe is in flight
+
+Halves the number of sequential round trips at the cost of a wasted request
+per probe. Only worth enabling when a request takes longer than DELAY, as
+the rate limiter spaces out the requests either way.
+"""
+
 #########################################################
 # END Configuration
 #########################################################
@@ -29,81 +39,165 @@ LEAGUES_ONLY: t.Final[t.List[Metric]] = [
   Metric("League Points", 0, 1)
 ]
 
+Fetcher = t.Callable[[Metric, int], t.Awaitable[t.List[MetricLeader]]]
+""" Fetches the leaders on a page of a metric """
+
+
+def load_json(path: str) -> t.Dict[str, t.Any]:
+    """ Loads a json object from a file, or an empty one if the file does not exist """
+    try:
+        return json.loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return {}
+
+
+def atomic_write_json(path: str, obj: t.Any) -> None:
+    """ Writes compact json to a file without ever leaving it partially written """
+    data = json.dumps(obj, separators=(",", ":"))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-", suffix=".json")
+
+    try:
+        # mkstemp makes the file owner only, so keep the mode of the file it replaces
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+
+        os.chmod(tmp, mode)
 
-async def binary_search(session: ClientSession, metric: Metric, low: int = 1, high: int = MAX_PAGE) -> t.Tuple[int, str]:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+async def binary_search(fetch: Fetcher, metric: Metric, low: int = 1, high: int = MAX_PAGE) -> t.Tuple[int, MetricLeader]:
     """ Finds the last page and player for a hiscore metric using binary search """
     _low = low
     _high = high
     last_page_with_data = low
     last_player: MetricLeader
+    ahead: t.Dict[int, asyncio.Future[t.List[MetricLeader]]] = {}
 
-    while _low <= _high:
-        mid = (_low + _high) // 2
-        board = await fetch_leaders(session, metric, mid)
+    try:
+        while _low <= _high:
+            mid = (_low + _high) // 2
+            pending = ahead.pop(mid, None)
 
-        if board[0].rank != 1:
-            last_page_with_data = mid
-            last_player = board[-1]
-            _low = mid + 1
-        else:
-            _high = mid - 1
+            # Whichever probe was not needed is for the half we ruled out
+            for probe in ahead.values():
+                probe.cancel()
+
+            ahead.clear()
+
+            if SPECULATIVE_PROBES:
+                if mid - 1 >= _low:
+                    page = (_low + mid - 1) // 2
+                    ahead[page] = asyncio.ensure_future(fetch(metric, page))
+
+                if mid + 1 <= _high:
+                    page = (mid + 1 + _high) // 2
+                    ahead[page] = asyncio.ensure_future(fetch(metric, page))
+
+            board = await (pending or fetch(metric, mid))
 
-        await asyncio.sleep(DELAY)
+            if board:
+                last_page_with_data = mid
+                last_player = board[-1]
+                _low = mid + 1
+            else:
+                _high = mid - 1
+    finally:
+        for probe in ahead.values():
+            probe.cancel()
 
     return last_page_with_data, last_player
 
 
-async def new_bounds(session: ClientSession, metric: Metric, low: int) -> t.Tuple[int, int]:
-    """ Finds new bounds to search within by using yesterday's bounds """
+async def new_bounds(fetch: Fetcher, metric: Metric, low: int) -> t.Tuple[int, int]:
+    """ Finds new bounds to search within by using yesterday's bounds
 
-    new_high = low + PAGE_SKIP
+    The step between probes doubles each time a probe still has data, so a
+    large drift since yesterday costs a logarithmic number of requests.
+    """
+
+    step = PAGE_SKIP
     new_low = low
+    new_high = min(low + step, MAX_PAGE)
     while True:
-        board = await fetch_leaders(session, metric, new_high)
+        board = await fetch(metric, new_high)
 
-        if board[0].rank == 1:
+        if not board or new_high == MAX_PAGE:
             return (new_low, new_high)
+
+        new_low = new_high
+        step *= 2
+        new_high = min(new_high + step, MAX_PAGE)
+
+
+async def _process_metric(
+    fetch: Fetcher, metric: Metric, last_page: t.Optional[int], sem: asyncio.Semaphore
+) -> t.Tuple[str, int, MetricLeader]:
+    """ Finds the last page and player for a single metric """
+    async with sem:
+        LOGGER.info("Finding last player for %s.", metric.name)
+
+        if last_page is None:
+            last_page_with_data, last_player = await binary_search(fetch, metric)
+        elif last_page + PAGE_SKIP >= MAX_PAGE:
+            # new_bounds could only probe MAX_PAGE, so search up to it directly
+            last_page_with_data, last_player = await binary_search(fetch, metric, last_page)
         else:
-            new_high += PAGE_SKIP
-            new_low += PAGE_SKIP
+            low, high = await new_bounds(fetch, metric, last_page)
+            last_page_with_data, last_player = await binary_search(fetch, metric, low, high)
+
+        LOGGER.info(
+            "Found last page of %s at page %d and last player: %s.",
+            metric.name, last_page_with_data, last_player.username)
+
+        return metric.name, last_page_with_data, last_player
 
 
 async def find_last_players(session: ClientSession) -> t.List[MetricLeader]:
-    if (Path(LAST_PAGES_FILE).is_file()):
-        with open(LAST_PAGES_FILE, "r") as f:
-            last_pages = json.load(f)
-    else:
-        last_pages = {}
+    last_pages = load_json(LAST_PAGES_FILE)
 
-    # The players ranked last in each metric
-    last_players: t.List[MetricLeader] = []
+    # Pages already fetched this run, so overlapping probes are free
+    page_cache: t.Dict[t.Tuple[str, int], t.List[MetricLeader]] = {}
 
-    for metric in LEAGUES_ONLY:
-        LOGGER.info(f"Finding last player for {metric.name}.")
+    async def cached_fetch(metric: Metric, page: int) -> t.List[MetricLeader]:
+        key = (metric.name, page)
 
-        if metric.name in last_pages:
-            last_page = last_pages[metric.name]
-            if last_page == MAX_PAGE:
-                last_page_with_data, last_player = await binary_search(session, metric, last_page)
-                last_players.append(last_player)
-                continue
+        if key not in page_cache:
+            page_cache[key] = await fetch_leaders(session, metric, page)
 
-            low, high = await new_bounds(session, metric, last_page)
+        return page_cache[key]
 
-            last_page_with_data, last_player = await binary_search(session, metric, low, high)
-        else:
-            last_page_with_data, last_player = await binary_search(session, metric)
+    # Each metric is independent, so search them concurrently
+    sem = asyncio.Semaphore(CONCURRENCY)
+    tasks = [_process_metric(cached_fetch, m, last_pages.get(m.name), sem) for m in LEAGUES_ONLY]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # The players ranked last in each metric
+    last_players: t.List[MetricLeader] = []
 
+    for metric, result in zip(LEAGUES_ONLY, results):
+        if isinstance(result, BaseException):
+            LOGGER.error(result)
+            LOGGER.error("Failed to find last player for %s due to previous error", metric.name)
+            continue
+
+        name, last_page_with_data, last_player = result
         last_players.append(last_player)
-        last_pages[metric.name] = last_page_with_data
-        LOGGER.info(
-            f"Found last page of {metric.name} at page {last_page_with_data} and last player: {last_player.username}.")
+        last_pages[name] = last_page_with_data
 
     # Write last pages to file for use at next scrape
-    data = json.dumps(last_pages, indent=4)
-    with open(LAST_PAGES_FILE, "w") as f:
-        LOGGER.info(f"Writing last pages to file...")
-        f.write(data)
+    LOGGER.info("Writing last pages to file...")
+    atomic_write_json(LAST_PAGES_FILE, last_pages)
 
     return last_players
 
@@ -112,9 +206,8 @@ async def main() -> None:
     LOGGER.info("*" * 64)
     LOGGER.info("WOM Leagues Last Page Scraper starting...")
 
-    session = ClientSession(headers={"User-Agent": BROWSER_USER_AGENT})
-    last_players = await find_last_players(session)
-    await session.close()
+    async with make_session() as session:
+        last_players = await find_last_players(session)
 
     LOGGER.info("Scrape complete")
 
@@ -123,4 +216,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -2,15 +2,22 @@
 
 import abc
 import asyncio
+import atexit
+import contextlib
+import io
 import logging
+import os
+import re
 import secrets
 import sys
 import typing as t
-from logging.handlers import RotatingFileHandler
+from dataclasses import dataclass, field
+from html import unescape
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 import wom
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup, Tag
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
 #########################################################
 # START Configuration
@@ -37,11 +44,31 @@ BASE_URL: t.Final[str] = "https://secure.runescape.com"
 DELAY: t.Final[int] = 5
 """The number of seconds to delay between requests to the hiscores."""
 
+BURST: t.Final[int] = 1
+"""The number of requests that can be sent back to back to the hiscores.
+
+Requests still average one per `DELAY` seconds, but up to this many can go
+out at once when earlier requests have left the budget unused.
+"""
+
+MAX_RETRIES: t.Final[int] = 3
+"""The number of times to retry a request the hiscores were too busy to serve."""
+
+CONCURRENCY: t.Final[int] = 8
+"""The maximum number of metrics to search on the hiscores at the same time."""
+
 # fmt: off
 BROWSER_USER_AGENT: t.Final[str] = "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0"
 """The user agent to send with requests to the hiscores."""
 # fmt: on
 
+CACHE_EXPIRY: t.Final[t.Optional[int]] = None
+"""The number of seconds to cache hiscores pages on disk (set to `None` to disable).
+
+Useful while developing to avoid fetching the same pages on every run.
+Requires `aiohttp-client-cache` to be installed.
+"""
+
 WOM_API_KEY: t.Final[t.Optional[str]] = None
 """The optional API Key for WOM."""
 
@@ -63,28 +90,112 @@ WOM_USER_AGENT: t.Final[str] = "WOM Leagues Scraper"
 #########################################################
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """A formatter that only formats the time once per second.
+
+    Log records mostly come in bursts within the same second, so reusing the
+    last timestamp skips the `localtime` and `strftime` calls for most of them.
+    """
+
+    def __init__(self, fmt: str, datefmt: str) -> None:
+        super().__init__(fmt, datefmt)
+        self._last_time: t.Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: t.Optional[str] = None) -> str:
+        if datefmt is None:
+            # The default format includes milliseconds, so can't be reused
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+
+        if second != self._last_time[0]:
+            self._last_time = (second, super().formatTime(record, datefmt))
+
+        return self._last_time[1]
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """A rotating file handler that writes to its file in whole blocks.
+
+    Records are only flushed when the buffer fills, on rollover, on close, or
+    when a warning or error is logged. The file size is tracked in memory, as
+    checking it on disk for every record would flush the buffer.
+    """
+
+    _builtin_open: t.Callable[..., t.IO[t.Any]]
+    """The builtin open, set by FileHandler so it's still usable during shutdown."""
+
+    def _open(self) -> io.TextIOWrapper:
+        try:
+            block_size = os.statvfs(os.path.dirname(self.baseFilename)).f_bsize
+        except (AttributeError, OSError):
+            block_size = io.DEFAULT_BUFFER_SIZE
+
+        stream = t.cast(
+            io.TextIOWrapper,
+            self._builtin_open(
+                self.baseFilename,
+                self.mode,
+                buffering=block_size * 8,
+                encoding=self.encoding,
+                errors=self.errors,
+            ),
+        )
+
+        self._size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            if 0 < self.maxBytes <= self._size + size:
+                self.doRollover()
+
+            self.stream.write(msg)
+            self._size += size
+
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 def setup_logging() -> logging.Logger:
     """Sets up and returns the logger to use in the script."""
     logger = logging.getLogger(__file__)
     logger.setLevel(LOG_LEVEL)
 
     sh = logging.StreamHandler(sys.stdout)
-    rfh = RotatingFileHandler(
+    rfh = BufferedRotatingFileHandler(
         "./wom-league-scraper.log",
         maxBytes=1048576,  # 1MB
         encoding="utf-8",
         backupCount=20,
     )
 
-    ff = logging.Formatter(
-        f"[%(asctime)s] [%(levelname)s] %(message)s",
+    ff = CachedTimeFormatter(
+        "[%(asctime)s] [%(levelname)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
     rfh.setFormatter(ff)
     sh.setFormatter(ff)
-    logger.addHandler(rfh)
-    logger.addHandler(sh)
+
+    # Records are written out by the listener's thread, so logging from
+    # coroutines never blocks the event loop on file or console io
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    listener = QueueListener(queue, rfh, sh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(QueueHandler(queue))
     return logger
 
 
@@ -99,54 +210,62 @@ LOGGER: t.Final[logging.Logger] = setup_logging()
 #########################################################
 
 
+@dataclass(frozen=True, slots=True)
 class Metric:
-    def __init__(self, name: str, table: int, category: t.Optional[int] = None) -> None:
-        self._name = name
-        self._table = table
-        self._category = category
+    name: str
+    """The name of the metric."""
 
-    def __str__(self) -> str:
-        return self._name
+    table: int
+    """The table number for the metric."""
 
-    @property
-    def name(self) -> str:
-        """The name of the metric."""
-        return self._name
+    category: t.Optional[int] = None
+    """The category of the metric, it it has one.
 
-    @property
-    def table(self) -> int:
-        """The table number for the metric."""
-        return self._table
+    All skills have no category, and everything else is category 1.
+    """
 
-    @property
-    def category(self) -> t.Optional[int]:
-        """The category of the metric, it it has one.
+    url_prefix: str = field(init=False, repr=False, compare=False)
+    """The hiscores url for this metric, missing only the page number.
 
-        All skills have no category, and everything else is category 1.
-        """
-        return self._category
+    Only the page changes between requests, so the rest of the url is
+    built once when the metric is created.
+    """
 
+    is_skill: bool = field(init=False, repr=False, compare=False)
+    """Whether this metric is a skill, rather than an activity or boss."""
 
-class MetricLeader(abc.ABC):
-    def __init__(self, metric: Metric, username: str, rank: int) -> None:
-        self._username = username
-        self._metric = metric
-        self._rank = rank
+    columns: int = field(init=False, repr=False, compare=False)
+    """The number of columns in the hiscores table for this metric.
 
-    @property
-    def metric(self) -> Metric:
-        """The metric this player leads in."""
-        return self._metric
+    Skills have 4 columns, bosses and activities have 3.
+    """
 
-    @property
-    def username(self) -> str:
-        """The username of the player leading."""
-        return self._username
+    def __post_init__(self) -> None:
+        params = {"category_type": self.category, "table": self.table}
+        query = "".join(f"{k}={v}&" for k, v in params.items() if v is not None)
+        mode = "hiscore_oldschool"
 
-    @property
-    def rank(self) -> int:
-        """The players rank in this metric."""
-        return self._rank
+        if ENABLE_SEASONAL:
+            mode += "_seasonal"
+
+        object.__setattr__(self, "url_prefix", f"{BASE_URL}/m={mode}/overall?{query}page=")
+        object.__setattr__(self, "is_skill", not self.category)
+        object.__setattr__(self, "columns", 4 if self.is_skill else 3)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True, slots=True)
+class MetricLeader(metaclass=abc.ABCMeta):
+    metric: Metric
+    """The metric this player leads in."""
+
+    username: str
+    """The username of the player leading."""
+
+    rank: int
+    """The players rank in this metric."""
 
     @abc.abstractmethod
     def __str__(self) -> str:
@@ -154,23 +273,13 @@ class MetricLeader(abc.ABC):
         ...
 
 
+@dataclass(frozen=True, slots=True)
 class SkillLeader(MetricLeader):
-    def __init__(
-        self, metric: Metric, username: str, rank: int, level: int, exp: int
-    ) -> None:
-        super().__init__(metric, username, rank)
-        self._level = level
-        self._exp = exp
-
-    @property
-    def level(self) -> int:
-        """The players level in this skill."""
-        return self._level
+    level: int
+    """The players level in this skill."""
 
-    @property
-    def exp(self) -> int:
-        """The players experience in this skill."""
-        return self._exp
+    exp: int
+    """The players experience in this skill."""
 
     def __str__(self) -> str:
         return (
@@ -179,29 +288,26 @@ class SkillLeader(MetricLeader):
         )
 
 
+@dataclass(frozen=True, slots=True)
 class NonSkillLeader(MetricLeader):
-    def __init__(self, metric: Metric, username: str, rank: int, score: int) -> None:
-        super().__init__(metric, username, rank)
-        self._score = score
-
-    @property
-    def score(self) -> int:
-        """The players (score/kills/points etc) in this metric."""
-        return self._score
+    score: int
+    """The players (score/kills/points etc) in this metric."""
 
     def __str__(self) -> str:
         return f"{self.metric.name}: Rank {self.rank} -> {self.username} with score {self.score}"
 
 
 class Group:
-    def __init__(self, client: wom.Client, details: wom.GroupDetail) -> None:
+    __slots__ = ("_details", "_client")
+
+    def __init__(self, client: wom.Client, details: wom.CreatedGroupDetail) -> None:
         self._details = details
         self._client = client
 
     @property
     def members(self) -> t.List[wom.GroupMembership]:
         """The members of this group."""
-        return self._details.memberships
+        return self._details.group.memberships
 
     @property
     def name(self) -> str:
@@ -211,7 +317,7 @@ class Group:
     @property
     def count(self) -> int:
         """The amount of leaders in the group."""
-        return len(self._details.memberships)
+        return len(self._details.group.memberships)
 
     @property
     def id(self) -> int:
@@ -221,7 +327,7 @@ class Group:
     @property
     def verification_code(self) -> str:
         """The verification cope of the group on WOM."""
-        return t.cast(str, self._details.verification_code)
+        return self._details.verification_code
 
     def __str__(self) -> str:
         return f"WOM Group {self.name} (id: {self.id}) with {self.count} members"
@@ -231,7 +337,7 @@ class Group:
         """Creates the group on WOM."""
         LOGGER.info("Creating group")
         result = await client.groups.create_group(
-            LEADER_GROUP_NAME, *(wom.GroupMemberFragment(m.username) for m in members)
+            LEADER_GROUP_NAME, *(m.username for m in members)
         )
 
         if result.is_err:
@@ -239,8 +345,8 @@ class Group:
             raise wom.WomError("Exiting due to previous error")
 
         group = cls(client, result.unwrap())
-        LOGGER.info(f"Created new {group}")
-        LOGGER.debug(f"Verification code: {group.verification_code}")
+        LOGGER.info("Created new %s", group)
+        LOGGER.debug("Verification code: %s", group.verification_code)
         return group
 
     async def update(self) -> None:
@@ -280,7 +386,38 @@ class Group:
                 f"Group deletion failed, investigate group id: {self.id}"
             )
 
-        LOGGER.info(f"Group deleted successfully")
+        LOGGER.info("Group deleted successfully")
+
+
+class RateLimiter:
+    """Limits requests to an average of `max_rate` per `period` seconds
+    across all tasks, allowing bursts of up to `max_rate` requests.
+
+    Each caller reserves the next free slot before it starts waiting, so
+    concurrent tasks are spaced out evenly instead of sleeping in lockstep.
+    """
+
+    __slots__ = ("_interval", "_burst", "_next")
+
+    def __init__(self, max_rate: int, period: float) -> None:
+        self._interval = period / max_rate
+        self._burst = self._interval * (max_rate - 1)
+        self._next = 0.0
+
+    async def __aenter__(self) -> None:
+        now = asyncio.get_running_loop().time()
+        slot = max(self._next, now)
+        self._next = slot + self._interval
+
+        if (wait := slot - self._burst - now) > 0:
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, *_: t.Any) -> None:
+        return None
+
+
+HISCORES_LIMITER: t.Final[RateLimiter] = RateLimiter(BURST, BURST * DELAY)
+"""Spaces out requests to the hiscores by `DELAY` seconds on average across all tasks."""
 
 
 #########################################################
@@ -291,7 +428,7 @@ class Group:
 # START Metrics
 #########################################################
 
-METRICS: t.Final[t.List[Metric]] = [
+_METRICS: t.List[Metric] = [
     Metric("Overall", 0),
     Metric("Attack", 1),
     Metric("Defence", 2),
@@ -389,18 +526,21 @@ METRICS: t.Final[t.List[Metric]] = [
 
 if ENABLE_SEASONAL:
     # Add league points
-    METRICS.insert(0, Metric("League Points", 0, 1))
+    _METRICS.insert(0, Metric("League Points", 0, 1))
 else:
     # Add bounty hunter
-    METRICS.extend(
-        {
+    _METRICS.extend(
+        [
             Metric("Bounty Hunter Hunter", 2, 1),
             Metric("Bounty Hunter Rogue", 3, 1),
             Metric("Bounty Hunter Hunter (Legacy)", 4, 1),
             Metric("Bounty Hunter Rogue (Legacy)", 5, 1),
-        }
+        ]
     )
 
+METRICS: t.Final[t.Tuple[Metric, ...]] = tuple(_METRICS)
+"""The metrics to fetch leaders for, in hiscores order."""
+
 #########################################################
 # END Metrics
 #########################################################
@@ -409,31 +549,40 @@ else:
 # START Utilities
 #########################################################
 
+TABLE_RE: t.Final[t.Pattern[bytes]] = re.compile(rb"<table.*?</table>", re.S)
+"""Matches the first table on a hiscores page, which holds the leaders."""
+
+CELL_RE: t.Final[t.Pattern[bytes]] = re.compile(rb"<td[^>]*>(.*?)</td>", re.S)
+"""Matches the inner html of a table cell."""
+
+TAG_RE: t.Final[t.Pattern[bytes]] = re.compile(rb"<[^>]+>")
+"""Matches any html tag, such as the links wrapping usernames."""
+
+COMMA_TABLE: t.Final[t.Dict[int, t.Optional[int]]] = str.maketrans("", "", ",")
+"""Translation table that removes commas."""
+
+NBSP_TABLE: t.Final[t.Dict[int, str]] = str.maketrans({"\xa0": " "})
+"""Translation table that replaces &nbsp; with a space."""
+
+RETRY_STATUSES: t.Final[t.FrozenSet[int]] = frozenset({429, 500, 502, 503, 504})
+"""The response statuses that mean the request is worth retrying."""
+
 
 def clean_table_data(data: str) -> str:
     """Strips and removes commas from the strings to integers can be parsed."""
-    return data.strip().replace(",", "")
+    return data.translate(COMMA_TABLE).strip()
 
 
 def clean_username(username: str) -> str:
     """Strips and replaces &nbsp; with a space."""
-    return username.strip().replace(u"\xa0", " ")
+    return username.translate(NBSP_TABLE).strip()
 
 
 def parse_leader(metric: Metric, row: t.Tuple[str, ...]) -> MetricLeader:
     """Parses a metric leader out of a tuple of strings holding the necessary
     data points.
     """
-    if metric.category:
-        # This is an activity or boss
-        rank, username, score = row
-        return NonSkillLeader(
-            metric,
-            clean_username(username),
-            int(clean_table_data(rank)),
-            int(clean_table_data(score)),
-        )
-    else:
+    if metric.is_skill:
         # This is a skill
         rank, username, level, exp = row
         return SkillLeader(
@@ -443,31 +592,141 @@ def parse_leader(metric: Metric, row: t.Tuple[str, ...]) -> MetricLeader:
             int(clean_table_data(level)),
             int(clean_table_data(exp)),
         )
+    else:
+        # This is an activity or boss
+        rank, username, score = row
+        return NonSkillLeader(
+            metric,
+            clean_username(username),
+            int(clean_table_data(rank)),
+            int(clean_table_data(score)),
+        )
+
+
+def parse_cells(raw: bytes, encoding: str = "utf-8") -> t.List[str]:
+    """Extracts the text of each cell in the leaders table of a hiscores page.
+
+    The page layout is fixed, so a regex scan is used rather than building
+    a whole DOM just to read a single table. Only the cells are decoded,
+    not the whole page.
+    """
+    table = TABLE_RE.search(raw)
+
+    if table is None:
+        return []
+
+    return [
+        unescape(TAG_RE.sub(b"", cell).decode(encoding, "replace"))
+        for cell in CELL_RE.findall(table.group())
+    ]
 
 
-def parse_leaders(metric: Metric, data: Tag) -> t.List[MetricLeader]:
-    """Transforms the parsed html table data into a list of metric leaders."""
-    # Skills have 4 columns, bosses and activities have 3
-    columns = 3 if metric.category else 4
+def parse_leaders(
+    metric: Metric, cells: t.List[str], seen: t.Optional[t.Set[str]] = None
+) -> t.List[MetricLeader]:
+    """Transforms the table cell text into a list of metric leaders.
 
+    If a set of seen usernames is passed, players already in it are skipped
+    before being parsed, and the new players are added to it once the whole
+    page has parsed.
+    """
     # Remove empty columns (bad data at the beginning of each table)
     # and group the necessary number of columns based on metric
-    rows = zip(*[iter(row.text for row in data if row.text)] * columns)
+    rows = zip(*[iter(cell for cell in cells if cell.strip())] * metric.columns)
 
-    # Parse and return the metric leaders
-    return [parse_leader(metric, row) for row in rows]
+    if seen is None:
+        # Parse and return the metric leaders
+        return [parse_leader(metric, row) for row in rows]
+
+    leaders: t.List[MetricLeader] = []
+    names: t.Set[str] = set()
+
+    for row in rows:
+        username = clean_username(row[1])
+
+        if username in seen or username in names:
+            continue
+
+        names.add(username)
+        leaders.append(parse_leader(metric, row))
+
+    # Only claim the names if nothing on the page failed to parse
+    seen.update(names)
+    return leaders
 
 
 def build_url(metric: Metric, page: int) -> str:
     """Builds the URL to use to fetch leaders for the given metric."""
-    params = {"category_type": metric.category, "table": metric.table, "page": page}
-    query = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-    mode = "hiscore_oldschool"
+    return f"{metric.url_prefix}{page}"
 
-    if ENABLE_SEASONAL:
-        mode += "_seasonal"
 
-    return f"{BASE_URL}/m={mode}/overall?{query}"
+def make_session() -> ClientSession:
+    """Creates the session to use for requests to the hiscores.
+
+    Connections are kept alive and DNS lookups are cached, so the TLS
+    handshake with the hiscores is only paid once per connection. No more
+    connections are opened than there can be concurrent searches.
+
+    If `CACHE_EXPIRY` is set, pages are also cached on disk.
+    """
+    connector = TCPConnector(
+        limit=CONCURRENCY,
+        limit_per_host=CONCURRENCY,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+        ttl_dns_cache=600,
+    )
+
+    options: t.Dict[str, t.Any] = {
+        "connector": connector,
+        "timeout": ClientTimeout(total=30, connect=10),
+        "headers": {"User-Agent": BROWSER_USER_AGENT},
+    }
+
+    # Narrowed through a local, as mypyc can't unbox a narrowed Final global
+    expiry = CACHE_EXPIRY
+
+    if expiry is None:
+        return ClientSession(**options)
+
+    # Only needed for development, so it isn't in the requirements
+    from aiohttp_client_cache import CachedSession, SQLiteBackend  # type: ignore[import-not-found]
+
+    cache = SQLiteBackend("wom-league-scraper-cache", expire_after=expiry)
+    return CachedSession(cache=cache, **options)
+
+
+def retry_delay(retry_after: t.Optional[str], attempt: int) -> float:
+    """Returns how many seconds to wait before retrying a request.
+
+    Uses the `Retry-After` header when it holds a number of seconds, otherwise
+    backs off exponentially from `DELAY`.
+    """
+    try:
+        return max(float(retry_after or ""), 0.0)
+    except ValueError:
+        return float(DELAY * 2**attempt)
+
+
+async def is_cached(session: ClientSession, url: str) -> bool:
+    """Whether the url is in the sessions on disk cache and not yet expired."""
+    cache = getattr(session, "cache", None)
+
+    if cache is None:
+        return False
+
+    # has_url also counts expired pages, which the session fetches again
+    return await cache.get_response(cache.create_key("GET", url)) is not None
+
+
+def run(coro: t.Coroutine[t.Any, t.Any, None]) -> None:
+    """Runs the scripts main coroutine, on uvloop if it is installed."""
+    try:
+        import uvloop  # type: ignore[import-not-found]
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
 
 
 #########################################################
@@ -475,57 +734,82 @@ def build_url(metric: Metric, page: int) -> str:
 #########################################################
 
 
-async def fetch_leaders(session: ClientSession, metric: Metric, page: int = 1) -> t.List[MetricLeader]:
+async def fetch_leaders(
+    session: ClientSession, metric: Metric, page: int = 1, seen: t.Optional[t.Set[str]] = None
+) -> t.List[MetricLeader]:
+    """Fetches the leaders on a page of the hiscores for the given metric.
+
+    Returns an empty list if the page is past the end of the hiscores. If a
+    set of seen usernames is passed, only players not in it are returned.
+    Raises `aiohttp.ClientResponseError` if the page could not be fetched.
+    """
     url = build_url(metric, page)
 
-    # Fetch the hiscores data for this metric
-    response = await session.get(url)
-    text = await response.text()
+    # Pages served from the on disk cache don't need to be rate limited
+    limiter: t.AsyncContextManager[None] = (
+        contextlib.nullcontext() if await is_cached(session, url) else HISCORES_LIMITER
+    )
+
+    # Fetch the hiscores data for this metric, backing off while they're busy
+    for attempt in range(MAX_RETRIES + 1):
+        async with limiter:
+            response = await session.get(url)
+
+        if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+
+        delay = retry_delay(response.headers.get("Retry-After"), attempt)
+        response.release()
+
+        LOGGER.warning("Got status %d for %s, retrying in %.0fs", response.status, url, delay)
+        await asyncio.sleep(delay)
+
+    # An empty list would read as past the end, so failures must raise
+    response.raise_for_status()
+    raw = await response.read()
 
     # Parse the HTML down to the table data
-    soup = BeautifulSoup(text, "html.parser")
-    table = t.cast(Tag, soup.findChild("table"))
-    rows = t.cast(Tag, table.findChildren("td"))
+    cells = parse_cells(raw, response.charset or "utf-8")
+
+    # The hiscores serve the first page again for pages past the end,
+    # so check the first rank before parsing every row
+    first = next((cell for cell in cells if cell.strip()), None)
+
+    if page > 1 and first is not None and int(clean_table_data(first)) == 1:
+        return []
 
     # Parse and return the metric leaders
-    return parse_leaders(metric, rows)
+    return parse_leaders(metric, cells, seen)
 
 
 async def fetch_all_leaders(session: ClientSession) -> t.List[MetricLeader]:
-    metric_limit = METRIC_LIMIT if METRIC_LIMIT else len(METRICS)
-    metric_leaders: t.List[MetricLeader] = []
-    is_unique: t.Callable[[MetricLeader], bool] = lambda l: not any(
-        l.username == m.username for m in metric_leaders
-    )
+    metrics = METRICS[: METRIC_LIMIT or None]
+    sem = asyncio.Semaphore(CONCURRENCY)
+    seen: t.Set[str] = set()
 
-    for i in range(metric_limit):
-        metric = METRICS[i]
-        LOGGER.info(f"Fetching leaders for {metric}")
+    async def fetch_metric(metric: Metric) -> t.List[MetricLeader]:
+        async with sem:
+            LOGGER.info("Fetching leaders for %s", metric)
 
-        try:
-            # Fetch leaders in this metric
-            leaders = await fetch_leaders(session, metric)
-            LOGGER.info(f"Found {len(leaders)} leaders for {metric}")
+            try:
+                # Fetch leaders in this metric we haven't already seen
+                leaders = await fetch_leaders(session, metric, seen=seen)
+            except Exception as e:
+                LOGGER.error(e)
+                LOGGER.error("Failed to parse leaders for %s due to previous error", metric)
+                return []
 
-            if LOG_LEVEL <= logging.DEBUG:
-                for leader in leaders:
-                    LOGGER.debug(leader)
+            LOGGER.info("Found %d unique leaders for %s", len(leaders), metric)
 
-            # Filter out players we have already seen
-            leaders = list(filter(is_unique, leaders))
-            LOGGER.info(f"Of those, {len(leaders)} were unique")
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                for leader in leaders:
+                    LOGGER.debug("%s", leader)
 
-            metric_leaders.extend(leaders)
-        except Exception as e:
-            LOGGER.error(e)
-            LOGGER.error(f"Failed to parse leaders for {metric} due to previous error")
-        finally:
-            if i < metric_limit - 1:
-                # Dont sleep on the final iteration
-                LOGGER.info(f"Sleeping for {DELAY} seconds...")
-                await asyncio.sleep(DELAY)
+            return leaders
 
-    return metric_leaders
+    # Fetch every metric concurrently, the rate limiter keeps us polite
+    results = await asyncio.gather(*(fetch_metric(m) for m in metrics))
+    return [leader for leaders in results for leader in leaders]
 
 
 async def submit_updates(leaders: t.List[MetricLeader]) -> None:
@@ -559,9 +843,9 @@ async def main() -> None:
     LOGGER.info("*" * 64)
     LOGGER.info("WOM Leagues Scraper starting...")
 
-    session = ClientSession(headers={"User-Agent": BROWSER_USER_AGENT})
-    leaders = await fetch_all_leaders(session)
-    await session.close()
+    async with make_session() as session:
+        leaders = await fetch_all_leaders(session)
+
     LOGGER.info("Scrape complete")
 
     await submit_updates(leaders)
@@ -569,4 +853,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())